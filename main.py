@@ -1,12 +1,44 @@
 import os
+import re
+import sys
 import json
-import tempfile
+import asyncio
+import argparse
+import shlex
+import functools
 import subprocess
+import importlib.util
 
+import httpx
+import openai
+import tenacity
 from dotenv import load_dotenv
-from openai import OpenAI
-
-# Schema for Ghostty theme (as a string to be embedded in the prompt)
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+# orjson is considerably faster than the stdlib json module; fall back to the
+# latter if it isn't installed. orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so callers can catch the stdlib exception either way.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def _json_loads(data):
+    """Parses a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj, indent=False):
+    """Serialises obj to UTF-8 encoded JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode()
+
+# Schema for Ghostty theme, annotated for developers (see GHOSTTY_THEME_SCHEMA for what is sent)
 # This schema is based on vibejam/schemas/ghostty.json
 GHOSTTY_SCHEMA_DESCRIPTION = """
 {
@@ -38,16 +70,116 @@ GHOSTTY_SCHEMA_DESCRIPTION = """
 // The comments (like "// ...") are for explanation and MUST NOT be included in the final JSON output.
 """
 
+# Small, fast model; the theme structure is enforced server-side via structured outputs
+OPENAI_MODEL = "gpt-4o-mini"
+
+# Top-level colour keys of a Ghostty theme besides "palette", in schema order
+_TOP_LEVEL_KEYS = ("background", "foreground", "cursor-color", "selection-background", "selection-foreground")
+
+# Per-slot palette roles, taken from the comments in GHOSTTY_SCHEMA_DESCRIPTION
+_PALETTE_ROLES = dict(re.findall(r'"(\d+)":[^/\n]*//\s*(.*\S)', GHOSTTY_SCHEMA_DESCRIPTION))
+
+_HEX_COLOR = {"type": "string", "description": "6-digit hexadecimal color code, e.g. \"#RRGGBB\""}
+
+# JSON Schema equivalent of GHOSTTY_SCHEMA_DESCRIPTION, in the subset accepted by
+# OpenAI structured outputs (every property required, no additional properties)
+GHOSTTY_THEME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "palette": {
+            "type": "object",
+            "properties": {
+                index: {**_HEX_COLOR, "description": role}
+                for index, role in _PALETTE_ROLES.items()
+            },
+            "required": list(_PALETTE_ROLES),
+            "additionalProperties": False,
+        },
+        **{key: _HEX_COLOR for key in _TOP_LEVEL_KEYS},
+    },
+    "required": ["palette", *_TOP_LEVEL_KEYS],
+    "additionalProperties": False,
+}
+
+_THEME_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "ghostty_theme", "schema": GHOSTTY_THEME_SCHEMA, "strict": True},
+}
+
+# Combined requests return an array of named themes, so the schema stays the same
+# whatever themes are asked for and OpenAI only has to process it once
+_COMBINED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ghostty_themes",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "themes": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"name": {"type": "string"}, "theme": GHOSTTY_THEME_SCHEMA},
+                        "required": ["name", "theme"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["themes"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+_PROMPT_TEMPLATE = """
+    Generate a color theme for the Ghostty terminal inspired by the keyword: "{theme_name}".
+    Ensure all color values are 6-digit hexadecimal strings starting with '# (e.g., "#RRGGBB").
+    """
+
+_SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert terminal color theme designer. You will be given a theme keyword and must return a Ghostty theme inspired by it, with a cohesive, readable palette."}
+
+# Upper bound on in-flight OpenAI requests when themes are generated concurrently
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Attempts per chat completion before a transient OpenAI error is given up on
+OPENAI_MAX_ATTEMPTS = 6
+
+# Frames cycled through while a streamed response is arriving
+_SPINNER_FRAMES = "|/-\\"
+
+# Polling interval bounds (seconds) while waiting on an OpenAI Batch API job
+BATCH_POLL_INITIAL_DELAY = 5
+BATCH_POLL_MAX_DELAY = 300
+
+# Used when several themes are requested at once: every keyword goes into a single
+# request and the themes come back as a top-level "themes" array of named entries.
+_COMBINED_PROMPT_TEMPLATE = """
+    Generate one color theme for the Ghostty terminal for each of the following keywords: {theme_names}.
+    Return one entry per keyword in "themes", using the keyword verbatim as its "name".
+    Ensure all color values are 6-digit hexadecimal strings starting with '# (e.g., "#RRGGBB").
+    """
+
+_COMBINED_SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert terminal color theme designer. You will be given a list of theme keywords and must return one Ghostty theme inspired by each, with a cohesive, readable palette."}
+
+@functools.lru_cache(maxsize=1)
 def load_api_key():
-    """Loads the OpenAI API key from the .env file at ~/vibejam/.env."""
-    # Construct the path to ~/vibejam/.env
-    env_path = os.path.join(os.path.expanduser('~'), 'vibejam', '.env')
-    # Load the .env file from the specified path.
-    # load_dotenv will not raise an error if the file is not found,
-    # but will return False. It will return True if found and loaded.
-    # The subsequent check for api_key handles cases where the key isn't loaded.
-    load_dotenv(dotenv_path=env_path)
-    api_key = os.getenv("OPENAI_API_KEY")
+    """Loads the OpenAI API key from the environment or the .env file at ~/vibejam/.env.
+
+    The result is cached, so the .env file is only read once per process.
+    """
+    # A key already in the environment wins (load_dotenv never overrides it anyway),
+    # so skip resolving and parsing the .env file entirely
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        # Construct the path to ~/vibejam/.env
+        env_path = os.path.join(os.path.expanduser('~'), 'vibejam', '.env')
+        # Load the .env file from the specified path.
+        # load_dotenv will not raise an error if the file is not found,
+        # but will return False. It will return True if found and loaded.
+        # The subsequent check for api_key handles cases where the key isn't loaded.
+        load_dotenv(dotenv_path=env_path)
+        api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         # env_path is defined earlier in this function's scope.
         print(f"Error: OPENAI_API_KEY not found.")
@@ -61,57 +193,159 @@ def load_api_key():
         exit(1)
     return api_key
 
+# Theme names that are already safe filenames, letting sanitize_theme_name skip any rewriting
+_VALID_THEME_NAME_RE = re.compile(r'[a-z0-9_-]+')
+# Characters that make a theme name invalid outright (path separators, shell/glob metacharacters, ...)
+_FORBIDDEN_THEME_NAME_CHARS_RE = re.compile(r'[ /\\.:*?"<>|]')
+# Anything other than letters, digits, hyphens and underscores is replaced when sanitizing
+_UNSAFE_THEME_NAME_CHARS_RE = re.compile(r'[^\w-]')
+
+def sanitize_theme_name(theme_name):
+    """Normalises a theme name for use as a filename, or returns None if it is invalid."""
+    theme_name = theme_name.strip().lower()
+    if _VALID_THEME_NAME_RE.fullmatch(theme_name):
+        return theme_name
+    if theme_name and _FORBIDDEN_THEME_NAME_CHARS_RE.search(theme_name) is None:
+        # Replace any potentially problematic characters for filenames, though the check above is quite strict
+        return _UNSAFE_THEME_NAME_CHARS_RE.sub('_', theme_name)
+    return None
+
 def get_theme_name():
     """Prompts the user for a single-word theme name."""
     while True:
-        theme_name = input("Enter a single-word theme name (e.g., 'brogrammer', 'dungeon', 'vaporwave'): ").strip().lower()
-        if theme_name and not any(c in theme_name for c in [' ', '/', '\\', '.', ':', '*', '?', '"', '<', '>', '|']):
-            # Replace any potentially problematic characters for filenames, though the check above is quite strict
-            theme_name = "".join(c if c.isalnum() or c in ['-', '_'] else '_' for c in theme_name)
+        theme_name = sanitize_theme_name(input("Enter a single-word theme name (e.g., 'brogrammer', 'dungeon', 'vaporwave'): "))
+        if theme_name:
             return theme_name
         else:
             print("Invalid theme name. Please enter a single word containing only letters, numbers, hyphens, or underscores.")
 
-def generate_ghostty_theme_json(api_key, theme_name):
-    """
-    Generates a Ghostty theme JSON using OpenAI.
+def parse_args():
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Generate Ghostty terminal themes using OpenAI.")
+    parser.add_argument(
+        "themes",
+        nargs="*",
+        help="one or more single-word theme names; prompts for one if omitted",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--parallel",
+        action="store_true",
+        help="send one concurrent request per theme instead of a single combined request",
+    )
+    mode.add_argument(
+        "--batch",
+        action="store_true",
+        help="submit themes through the OpenAI Batch API (half price, may take up to 24h)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"maximum number of concurrent OpenAI requests (default: {DEFAULT_MAX_CONCURRENCY})",
+    )
+    return parser.parse_args()
+
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key):
+    """Returns a cached async OpenAI client so its HTTP session is reused across calls."""
+    # HTTP/2 multiplexes concurrent requests over one kept-alive TCP+TLS connection,
+    # so the handshake is paid once per session rather than once per request
+    http_client = DefaultAsyncHttpxClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=10),
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
+
+def _theme_request_body(theme_name):
+    """Builds the chat completion request body for a single theme."""
+    return {
+        "model": OPENAI_MODEL,
+        "messages": [
+            _SYSTEM_MESSAGE,
+            {"role": "user", "content": _PROMPT_TEMPLATE.format(theme_name=theme_name)}
+        ],
+        "response_format": _THEME_RESPONSE_FORMAT
+    }
+
+def _log_retry(retry_state):
+    """Reports a transient OpenAI failure before tenacity sleeps and retries."""
+    print(f"\nOpenAI request failed ({retry_state.outcome.exception()}); "
+          f"retrying in {retry_state.next_action.sleep:.1f}s "
+          f"(attempt {retry_state.attempt_number + 1} of {OPENAI_MAX_ATTEMPTS})...")
+
+def _is_transient_openai_error(exc):
+    """Returns True for OpenAI failures that are worth retrying."""
+    if isinstance(exc, openai.RateLimitError):
+        # An exhausted quota is also reported as a 429 but will not clear up on its own
+        return exc.code != "insufficient_quota"
+    # Once a stream has started, dropped connections surface as raw httpx errors
+    # rather than openai.APIConnectionError
+    return isinstance(exc, (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        httpx.TransportError,
+    ))
+
+# Transient failures (rate limits, timeouts, dropped connections, 5xx) are retried
+# with jittered exponential backoff; anything else, including bad JSON, is not
+@tenacity.retry(
+    wait=tenacity.wait_random_exponential(min=1, max=30),
+    stop=tenacity.stop_after_attempt(OPENAI_MAX_ATTEMPTS),
+    retry=tenacity.retry_if_exception(_is_transient_openai_error),
+    before_sleep=_log_retry,
+    reraise=True,
+)
+async def _stream_completion_content(client, label, request, show_spinner=True):
     """
-    client = OpenAI(api_key=api_key)
-
-    prompt_content = f"""
-    You are a helpful assistant that generates color themes for the Ghostty terminal.
-    The user wants a theme inspired by the keyword: "{theme_name}".
+    Issues a streaming chat completion and returns the full message content.
 
-    Please generate a valid JSON configuration for a Ghostty theme.
-    The JSON output MUST strictly adhere to the following schema and structure:
-    {GHOSTTY_SCHEMA_DESCRIPTION}
-
-    Ensure all color values are 6-digit hexadecimal strings starting with '# (e.g., "#RRGGBB").
-    Do NOT include any comments (like "// ...") in the JSON output.
-    Do NOT output any text or explanations before or after the JSON object.
-    The output must be only the JSON object itself, parseable by a standard JSON parser.
+    Unless show_spinner is False, a spinner is shown on interactive terminals while
+    chunks arrive, so output starts immediately instead of after the whole response
+    has been generated. Callers running several streams at once should disable it,
+    since the spinners would all share one terminal line.
+    """
+    show_spinner = show_spinner and sys.stdout.isatty()
+    status = f"Receiving {label}..."
+    parts = []
+
+    # Retries are handled by the decorator above, so the SDK's own are disabled here
+    stream = await client.with_options(max_retries=0).chat.completions.create(**request, stream=True)
+    async for chunk in stream:
+        if chunk.choices:
+            parts.append(chunk.choices[0].delta.content or "")
+        if show_spinner:
+            sys.stdout.write(f"\r{_SPINNER_FRAMES[len(parts) % len(_SPINNER_FRAMES)]} {status}")
+            sys.stdout.flush()
+
+    if show_spinner:
+        # Clear the spinner line before normal output resumes
+        sys.stdout.write("\r" + " " * (len(status) + 2) + "\r")
+        sys.stdout.flush()
+    return "".join(parts)
+
+async def generate_ghostty_theme_json_async(client, theme_name, semaphore, show_spinner=True):
     """
+    Generates one Ghostty theme JSON using OpenAI.
 
+    semaphore bounds how many of these requests are in flight at once; show_spinner
+    should only be set when this is the only one.
+    """
     try:
-        print(f"\nGenerating theme '{theme_name}' using OpenAI GPT-4o...")
-        completion = client.chat.completions.create(
-            model="gpt-4o", # Using a modern model that supports JSON mode well
-            messages=[
-                {"role": "system", "content": "You are an expert JSON generator. You will be given a schema description and a theme keyword. You must return a valid JSON object matching the schema, inspired by the keyword. Only output the JSON object, with no surrounding text or markdown."},
-                {"role": "user", "content": prompt_content}
-            ],
-            response_format={"type": "json_object"} # Request JSON output
-        )
-
-        theme_json_string = completion.choices[0].message.content
+        async with semaphore:
+            print(f"\nGenerating theme '{theme_name}' using OpenAI {OPENAI_MODEL}...")
+            theme_json_string = await _stream_completion_content(
+                client, f"theme '{theme_name}'", _theme_request_body(theme_name), show_spinner=show_spinner
+            )
 
         # Validate if the response is indeed JSON and parse it
-        theme_data = json.loads(theme_json_string)
-        print("Theme JSON successfully generated and parsed.")
+        theme_data = _json_loads(theme_json_string)
+        print(f"Theme '{theme_name}' JSON successfully generated and parsed.")
         return theme_data
 
     except json.JSONDecodeError as e:
-        print(f"Error: OpenAI API did not return valid JSON. {e}")
+        print(f"Error: OpenAI API did not return valid JSON for '{theme_name}'. {e}")
         print("Raw response from API was:")
         # Only print response string if it was assigned
         if 'theme_json_string' in locals() and theme_json_string:
@@ -123,6 +357,161 @@ def generate_ghostty_theme_json(api_key, theme_name):
         print(f"An error occurred while communicating with OpenAI: {e}")
         return None
 
+async def _generate_combined_themes_json_async(client, theme_names):
+    """
+    Generates several Ghostty themes in a single OpenAI request.
+
+    Returns a dict of theme name to theme data for every theme that came back
+    well-formed, or None if the request itself failed.
+    """
+    prompt_content = _COMBINED_PROMPT_TEMPLATE.format(
+        theme_names=", ".join(f'"{name}"' for name in theme_names)
+    )
+
+    try:
+        print(f"\nGenerating {len(theme_names)} themes ({', '.join(theme_names)}) using OpenAI {OPENAI_MODEL}...")
+        themes_json_string = await _stream_completion_content(client, f"{len(theme_names)} themes", {
+            "model": OPENAI_MODEL,
+            "messages": [
+                _COMBINED_SYSTEM_MESSAGE,
+                {"role": "user", "content": prompt_content}
+            ],
+            "n": 1,
+            "response_format": _COMBINED_RESPONSE_FORMAT
+        })
+        # Map entries back by name; unrequested or duplicate names are ignored, and
+        # anything missing is left for the caller's per-theme fallback
+        requested = set(theme_names)
+        themes = {}
+        for entry in _json_loads(themes_json_string)["themes"]:
+            name = entry.get("name")
+            if name in requested and name not in themes and isinstance(entry.get("theme"), dict):
+                themes[name] = entry["theme"]
+        print(f"{len(themes)} of {len(theme_names)} themes successfully generated and parsed.")
+        return themes
+
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        print(f"Error: OpenAI API did not return a valid combined themes object. {e}")
+        return {}
+    except Exception as e:
+        print(f"An error occurred while communicating with OpenAI: {e}")
+        return None
+
+async def generate_ghostty_themes_async(client, theme_names: list[str], combined=True, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Generates Ghostty theme JSON for each name in theme_names using OpenAI.
+
+    With combined=True, all names are sent in a single request and any theme missing
+    or malformed in the combined response is retried on its own. Otherwise one
+    request per theme is issued, at most max_concurrency at a time. Returns a dict of
+    theme name to theme data, omitting themes that could not be generated.
+    """
+    themes = {}
+    if combined and len(theme_names) > 1:
+        themes = await _generate_combined_themes_json_async(client, theme_names)
+        if themes is None:
+            return {}
+
+    # One request per theme for anything not already generated, dispatched concurrently
+    remaining = [name for name in theme_names if name not in themes]
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # Concurrent spinners would overwrite each other, so only show one for a lone request
+    show_spinner = len(remaining) == 1 or max_concurrency == 1
+    results = await asyncio.gather(
+        *[generate_ghostty_theme_json_async(client, name, semaphore, show_spinner) for name in remaining]
+    )
+    themes.update((name, theme_data) for name, theme_data in zip(remaining, results) if theme_data)
+
+    return themes
+
+async def generate_themes_via_batch_async(client, theme_names: list[str]):
+    """
+    Generates Ghostty themes through the OpenAI Batch API.
+
+    Batch jobs are billed at half price and draw on a separate rate-limit pool, but
+    may take up to 24 hours to complete. Returns a dict of theme name to theme data,
+    omitting themes that could not be generated.
+    """
+    themes = {}
+    try:
+        # One request per line, keyed by theme name so results can be matched back up
+        batch_jsonl = b"".join(
+            _json_dumps({"custom_id": name, "method": "POST", "url": "/v1/chat/completions", "body": _theme_request_body(name)}) + b"\n"
+            for name in theme_names
+        )
+        input_file = await client.files.create(file=("themes.jsonl", batch_jsonl), purpose="batch")
+
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+    except Exception as e:
+        print(f"An error occurred while submitting the batch to OpenAI: {e}")
+        return themes
+    print(f"\nSubmitted batch {batch.id} for {len(theme_names)} themes ({', '.join(theme_names)}).")
+
+    # Poll with exponential backoff until the job reaches a terminal state. The job is
+    # already paid for and may run for hours, so transient polling errors are ridden out
+    delay = BATCH_POLL_INITIAL_DELAY
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        print(f"Batch {batch.id} is {batch.status}; checking again in {delay}s...")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+        try:
+            batch = await client.batches.retrieve(batch.id)
+        except Exception as e:
+            if not _is_transient_openai_error(e):
+                print(f"An error occurred while checking batch {batch.id}: {e}")
+                print(f"The batch may still be running; its results can be retrieved later using ID {batch.id}.")
+                return themes
+            print(f"Could not check batch {batch.id} ({e}); will try again.")
+
+    if batch.status != "completed":
+        print(f"Batch {batch.id} ended with status '{batch.status}'.")
+    if batch.status == "failed" and batch.errors and batch.errors.data:
+        for error in batch.errors.data:
+            location = f" (line {error.line})" if error.line is not None else ""
+            print(f"  {error.code}{location}: {error.message}")
+    # Expired or cancelled jobs may still carry results for the requests that finished
+    if not batch.output_file_id:
+        return themes
+
+    try:
+        output = await client.files.content(batch.output_file_id)
+    except Exception as e:
+        print(f"An error occurred while downloading results of batch {batch.id}: {e}")
+        print(f"The results can be retrieved later from output file {batch.output_file_id}.")
+        return themes
+
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            result = _json_loads(line)
+            name = result["custom_id"]
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                print(f"Error: batch request for '{name}' failed: {result.get('error') or response.get('body')}")
+                continue
+            themes[name] = _json_loads(response["body"]["choices"][0]["message"]["content"])
+        except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+            print(f"Error: could not parse a batch result line. {e}")
+
+    print(f"{len(themes)} of {len(theme_names)} themes successfully generated and parsed.")
+    return themes
+
+# Directories already known to exist, so repeated saves skip the filesystem check
+_VERIFIED_DIRS = set()
+
+def _ensure_dir(dir_path):
+    """Creates dir_path if it is missing, checking each directory at most once per process."""
+    if dir_path in _VERIFIED_DIRS:
+        return
+    if not os.path.isdir(dir_path):
+        os.makedirs(dir_path, exist_ok=True)
+    _VERIFIED_DIRS.add(dir_path)
+
 def save_theme_to_file(theme_name, theme_data):
     """Saves the theme JSON to a file."""
     # Assumes script is run from project root (e.g., vibejam/), so paths are relative
@@ -131,41 +520,54 @@ def save_theme_to_file(theme_name, theme_data):
     # Ensure the directory exists (it should have been created by the assistant earlier)
     # For robustness, we can ensure it here too.
     try:
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
     except OSError as e:
         print(f"Error creating directory {output_dir}: {e}")
         return
 
     file_path = os.path.join(output_dir, f"{theme_name}.json")
 
+    # Encode the whole document up front so it reaches the file in a single write,
+    # rather than json.dump's many small chunked writes
+    content = _json_dumps(theme_data, indent=True) # Using indent=2 for readability
+
     try:
-        with open(file_path, 'w') as f:
-            json.dump(theme_data, f, indent=2) # Using indent=2 for readability
+        with open(file_path, 'wb') as f:
+            f.write(content)
         print(f"Theme '{theme_name}' saved successfully to {file_path}")
     except IOError as e:
         print(f"Error saving theme file {file_path}: {e}")
 
 def convert_theme_to_conf(theme_data):
     """Converts the parsed theme JSON data into Ghostty's flat .conf style string."""
-    lines = []
-
     # Handle palette entries first (indices 0-15 in order)
     palette = theme_data.get("palette", {})
-    for i in range(16):
-        hex_code = palette.get(str(i))
-        if not hex_code:
-            print(f"Warning: Palette index {i} missing in generated theme data.")
-            continue
-        lines.append(f"palette = {i}={hex_code}")
+    pget = palette.get
+    palette_lines = [f"palette = {i}={pget(str(i))}" for i in range(16) if pget(str(i))]
+    if len(palette_lines) < 16:
+        for i in range(16):
+            if not pget(str(i)):
+                print(f"Warning: Palette index {i} missing in generated theme data.")
 
-    # Handle the remaining top-level keys (background, foreground, etc.)
-    for key, value in theme_data.items():
-        if key == "palette":
-            continue  # already handled
-        lines.append(f"{key} = {value}")
+    # Handle the remaining top-level keys (background, foreground, etc.) in schema order
+    other_lines = [f"{key} = {theme_data[key]}" for key in _TOP_LEVEL_KEYS if key in theme_data]
 
     # Join with newlines and ensure trailing newline for POSIX friendliness
-    return "\n".join(lines) + "\n"
+    return "\n".join([*palette_lines, *other_lines]) + "\n"
+
+def _write_all(fd, buf):
+    """Writes the whole of buf to the file descriptor fd, retrying on short writes."""
+    view = memoryview(buf)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _write_file_bytes(file_path, buf, mode=0o644):
+    """Creates or truncates file_path and writes buf to it with raw os-level writes."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        _write_all(fd, buf)
+    finally:
+        os.close(fd)
 
 def save_conf_to_ghostty(theme_name, conf_content):
     """Saves the stripped-down .conf content to Ghostty's themes directory."""
@@ -174,7 +576,7 @@ def save_conf_to_ghostty(theme_name, conf_content):
 
     # Ensure the destination directory exists (Ghostty installer should create it, but be safe)
     try:
-        os.makedirs(ghostty_themes_dir, exist_ok=True)
+        _ensure_dir(ghostty_themes_dir)
     except OSError as e:
         print(f"Error ensuring Ghostty themes directory exists at {ghostty_themes_dir}: {e}")
         # If permission denied, offer to elevate using sudo
@@ -183,8 +585,7 @@ def save_conf_to_ghostty(theme_name, conf_content):
         return
 
     try:
-        with open(file_path, "w") as f:
-            f.write(conf_content)
+        _write_file_bytes(file_path, conf_content.encode("utf-8"))
         print(f"Stripped theme saved successfully to {file_path}")
     except IOError as e:
         print(f"Error writing stripped theme to {file_path}: {e}")
@@ -209,52 +610,79 @@ def prompt_and_attempt_sudo_save(theme_name: str, conf_content: str):
 
 def _attempt_save_with_sudo(conf_content: str, dir_path: str, file_path: str):
     """Uses sudo to mkdir -p dir_path and write conf_content to file_path."""
-    # Ensure directory exists with sudo
+    # Prime (or refresh) sudo's cached credential up front. sudo -v only prompts if
+    # there is no valid timestamp, and the real work below then runs with -n so it
+    # can never trigger a second authentication
     print("Requesting administrator privileges to write theme file via sudo...")
-    mkdir_cmd = ["sudo", "mkdir", "-p", dir_path]
-    result = subprocess.run(mkdir_cmd)
+    result = subprocess.run(["sudo", "-v"], check=False)
     if result.returncode != 0:
-        raise RuntimeError(f"sudo mkdir returned non-zero exit status {result.returncode}")
-
-    # Write content using a temporary file then sudo mv
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(conf_content.encode())
-        tmp_path = tmp.name
-
-    mv_cmd = ["sudo", "mv", tmp_path, file_path]
-    result = subprocess.run(mv_cmd)
+        raise RuntimeError(f"sudo -v returned non-zero exit status {result.returncode}")
+
+    # Create the directory and write the file under a single sudo call, piping the
+    # content straight through stdin so no temporary file is needed
+    script = f"mkdir -p {shlex.quote(dir_path)} && cat > {shlex.quote(file_path)}"
+    result = subprocess.run(
+        ["sudo", "-n", "sh", "-c", script],
+        input=conf_content.encode("utf-8"),
+        stdout=subprocess.DEVNULL,
+        check=False,
+    )
     if result.returncode != 0:
-        # Clean up temp file if mv fails
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
-        raise RuntimeError(f"sudo mv returned non-zero exit status {result.returncode}")
+        raise RuntimeError(f"sudo mkdir/write returned non-zero exit status {result.returncode}")
 
     print(f"Stripped theme saved successfully via sudo to {file_path}")
 
-def main():
-    """Main function to run the script."""
+async def main_async():
+    """Main coroutine: generates the requested themes and installs them."""
     print("Ghostty Theme Generator")
     print("-----------------------")
 
+    args = parse_args()
+
     api_key = load_api_key()
     if not api_key:
         return # Error message already printed by load_api_key
 
-    theme_name = get_theme_name()
+    # Theme names given on the command line skip the interactive prompt
+    theme_names = []
+    for name in args.themes:
+        theme_name = sanitize_theme_name(name)
+        if theme_name is None:
+            print(f"Skipping invalid theme name '{name}'. Use a single word containing only letters, numbers, hyphens, or underscores.")
+            continue
+        if theme_name not in theme_names:
+            theme_names.append(theme_name)
+    if not args.themes:
+        theme_names = [get_theme_name()]
+    if not theme_names:
+        return
+
+    client = _get_client(api_key)
+    if args.batch:
+        themes = await generate_themes_via_batch_async(client, theme_names)
+    else:
+        themes = await generate_ghostty_themes_async(
+            client,
+            theme_names,
+            combined=not args.parallel,
+            max_concurrency=max(1, args.max_concurrency),
+        )
 
-    theme_data = generate_ghostty_theme_json(api_key, theme_name)
+    for theme_name in theme_names:
+        theme_data = themes.get(theme_name)
+        if theme_data:
+            # Save full JSON for development/readability
+            save_theme_to_file(theme_name, theme_data)
 
-    if theme_data:
-        # Save full JSON for development/readability
-        save_theme_to_file(theme_name, theme_data)
+            # Convert to flat .conf string and save to Ghostty themes directory
+            conf_content = convert_theme_to_conf(theme_data)
+            save_conf_to_ghostty(theme_name, conf_content)
+        else:
+            print(f"Failed to generate theme data for '{theme_name}'.")
 
-        # Convert to flat .conf string and save to Ghostty themes directory
-        conf_content = convert_theme_to_conf(theme_data)
-        save_conf_to_ghostty(theme_name, conf_content)
-    else:
-        print(f"Failed to generate theme data for '{theme_name}'.")
+def main():
+    """Main function to run the script."""
+    asyncio.run(main_async())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,104 @@
+import json
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+from openai import AsyncOpenAI
+
+import main
+
+THEME = {
+    "palette": {str(i): f"#{i:02X}{i:02X}{i:02X}" for i in range(16)},
+    "background": "#000000",
+    "foreground": "#FFFFFF",
+    "cursor-color": "#FF0000",
+    "selection-background": "#333333",
+    "selection-foreground": "#EEEEEE",
+}
+
+def _batch(status, output_file_id=None, errors=None):
+    return {
+        "id": "batch_1",
+        "object": "batch",
+        "endpoint": "/v1/chat/completions",
+        "input_file_id": "file_in",
+        "completion_window": "24h",
+        "created_at": 0,
+        "status": status,
+        "output_file_id": output_file_id,
+        "errors": errors,
+    }
+
+def _client(handler):
+    return AsyncOpenAI(
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_retries=0,
+    )
+
+_UPLOADED_FILE = {
+    "id": "file_in", "object": "file", "bytes": 0, "created_at": 0,
+    "filename": "themes.jsonl", "purpose": "batch", "status": "processed",
+}
+
+class BatchApiTest(unittest.TestCase):
+    def test_batch_round_trip(self):
+        uploads = []
+        polls = []
+
+        def handler(request):
+            path = request.url.path
+            if request.method == "POST" and path == "/v1/files":
+                uploads.append(request.read())
+                return httpx.Response(200, json=_UPLOADED_FILE)
+            if request.method == "POST" and path == "/v1/batches":
+                return httpx.Response(200, json=_batch("validating"))
+            if request.method == "GET" and path == "/v1/batches/batch_1":
+                polls.append(request)
+                # The first poll fails transiently; polling must carry on regardless
+                if len(polls) == 1:
+                    return httpx.Response(503, json={"error": {"message": "unavailable"}})
+                return httpx.Response(200, json=_batch("completed", "file_out"))
+            if request.method == "GET" and path == "/v1/files/file_out/content":
+                lines = [
+                    {"custom_id": "alpha", "response": {"status_code": 200, "body": {
+                        "choices": [{"message": {"content": json.dumps(THEME)}}]}}},
+                    {"custom_id": "beta", "response": {"status_code": 500, "body": {}}, "error": "boom"},
+                ]
+                return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines).encode())
+            return httpx.Response(404)
+
+        with mock.patch.object(main, "BATCH_POLL_INITIAL_DELAY", 0), mock.patch("builtins.print"):
+            themes = asyncio.run(main.generate_themes_via_batch_async(_client(handler), ["alpha", "beta"]))
+
+        self.assertEqual(themes, {"alpha": THEME})
+        self.assertEqual(len(polls), 2)
+        self.assertEqual(len(uploads), 1)
+        self.assertIn(b'filename="themes.jsonl"', uploads[0])
+        self.assertIn(b'"alpha"', uploads[0])
+        self.assertIn(b'"beta"', uploads[0])
+
+    def test_failed_batch_reports_errors(self):
+        def handler(request):
+            path = request.url.path
+            if request.method == "POST" and path == "/v1/files":
+                return httpx.Response(200, json=_UPLOADED_FILE)
+            if request.method == "POST" and path == "/v1/batches":
+                return httpx.Response(200, json=_batch("validating"))
+            if request.method == "GET" and path == "/v1/batches/batch_1":
+                return httpx.Response(200, json=_batch("failed", errors={"object": "list", "data": [
+                    {"code": "invalid_request", "line": 1, "message": "bad model", "param": "body.model"},
+                ]}))
+            return httpx.Response(404)
+
+        with mock.patch.object(main, "BATCH_POLL_INITIAL_DELAY", 0), mock.patch("builtins.print") as printed:
+            themes = asyncio.run(main.generate_themes_via_batch_async(_client(handler), ["alpha"]))
+
+        self.assertEqual(themes, {})
+        output = "\n".join(str(call.args[0]) for call in printed.call_args_list if call.args)
+        self.assertIn("status 'failed'", output)
+        self.assertIn("invalid_request (line 1): bad model", output)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+from openai import AsyncOpenAI
+
+import main
+
+THEME = {
+    "palette": {str(i): f"#{i:02X}{i:02X}{i:02X}" for i in range(16)},
+    "background": "#000000",
+    "foreground": "#FFFFFF",
+    "cursor-color": "#FF0000",
+    "selection-background": "#333333",
+    "selection-foreground": "#EEEEEE",
+}
+
+def _sse(text):
+    chunk = {
+        "id": "chunk", "object": "chat.completion.chunk", "created": 0, "model": main.OPENAI_MODEL,
+        "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode()
+
+class CombinedRequestTest(unittest.TestCase):
+    def test_combined_themes_are_mapped_by_name(self):
+        requests = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            requests.append(body)
+            if body["response_format"] == main._COMBINED_RESPONSE_FORMAT:
+                # "beta" is missing and "gamma" was never asked for
+                content = json.dumps({"themes": [
+                    {"name": "alpha", "theme": THEME},
+                    {"name": "gamma", "theme": THEME},
+                ]})
+            else:
+                content = json.dumps(THEME)
+            return httpx.Response(200, content=_sse(content), headers={"content-type": "text/event-stream"})
+
+        client = AsyncOpenAI(
+            api_key="test",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        with mock.patch("builtins.print"):
+            themes = asyncio.run(main.generate_ghostty_themes_async(client, ["alpha", "beta"]))
+
+        self.assertEqual(themes, {"alpha": THEME, "beta": THEME})
+        # One combined request, then a single-theme fallback for "beta" only
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0]["response_format"], main._COMBINED_RESPONSE_FORMAT)
+        self.assertEqual(requests[1]["response_format"], main._THEME_RESPONSE_FORMAT)
+        self.assertIn('"beta"', requests[1]["messages"][1]["content"])
+
+if __name__ == "__main__":
+    unittest.main()
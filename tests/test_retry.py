@@ -0,0 +1,78 @@
+import json
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+import openai
+import tenacity
+from openai import AsyncOpenAI
+
+import main
+
+CONTENT = json.dumps({"background": "#000000"})
+
+def _sse(text):
+    chunk = {
+        "id": "chunk", "object": "chat.completion.chunk", "created": 0, "model": main.OPENAI_MODEL,
+        "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+class _BrokenStream(httpx.AsyncByteStream):
+    """Yields one SSE chunk, then drops the connection."""
+
+    async def __aiter__(self):
+        yield _sse(CONTENT[:5])
+        raise httpx.RemoteProtocolError("peer closed connection")
+
+def _client(handler):
+    return AsyncOpenAI(
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+def _stream(client):
+    no_wait = main._stream_completion_content.retry_with(wait=tenacity.wait_none())
+    with mock.patch("builtins.print"):
+        return asyncio.run(no_wait(client, "test", main._theme_request_body("test")))
+
+class RetryTest(unittest.TestCase):
+    def test_stream_dropped_midway_is_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            headers = {"content-type": "text/event-stream"}
+            if len(calls) == 1:
+                return httpx.Response(200, stream=_BrokenStream(), headers=headers)
+            return httpx.Response(200, content=_sse(CONTENT) + b"data: [DONE]\n\n", headers=headers)
+
+        self.assertEqual(_stream(_client(handler)), CONTENT)
+        self.assertEqual(len(calls), 2)
+
+    def test_insufficient_quota_is_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429, json={"error": {"message": "quota", "code": "insufficient_quota"}})
+
+        with self.assertRaises(openai.RateLimitError):
+            _stream(_client(handler))
+        self.assertEqual(len(calls), 1)
+
+    def test_rate_limit_is_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, json={"error": {"message": "slow down", "code": "rate_limit_exceeded"}})
+            return httpx.Response(200, content=_sse(CONTENT) + b"data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+
+        self.assertEqual(_stream(_client(handler)), CONTENT)
+        self.assertEqual(len(calls), 2)
+
+if __name__ == "__main__":
+    unittest.main()